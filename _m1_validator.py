@@ -0,0 +1,58 @@
+# Generated by scripts/gen_validator.py from docs/schema_m1.json - do not edit.
+# Regenerate with: python scripts/gen_validator.py
+SCHEMA_SHA256 = "9e40291fd993a107bdd3880d76db8b8e592a4b1bc70b047424d2acfe5f994374"
+VERSION = "2.22.2"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException
+
+
+NoneType = type(None)
+
+def validate_https___api_example_com_schemas_m1_json(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'https://json-schema.org/draft/2020-12/schema', '$id': 'https://api.example.com/schemas/m1.json', 'title': 'M1 Schema', 'description': 'JSON Schema for M1 API validation', 'version': '1.0.0', 'type': 'object', 'properties': {'version': {'type': 'string', 'const': '1.0.0', 'description': 'Schema version'}, 'data': {'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}}, 'required': ['version', 'data'], 'additionalProperties': False}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['version', 'data']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'https://json-schema.org/draft/2020-12/schema', '$id': 'https://api.example.com/schemas/m1.json', 'title': 'M1 Schema', 'description': 'JSON Schema for M1 API validation', 'version': '1.0.0', 'type': 'object', 'properties': {'version': {'type': 'string', 'const': '1.0.0', 'description': 'Schema version'}, 'data': {'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}}, 'required': ['version', 'data'], 'additionalProperties': False}, rule='required')
+        data_keys = set(data.keys())
+        if "version" in data_keys:
+            data_keys.remove("version")
+            data__version = data["version"]
+            if not isinstance(data__version, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".version must be string", value=data__version, name="" + (name_prefix or "data") + ".version", definition={'type': 'string', 'const': '1.0.0', 'description': 'Schema version'}, rule='type')
+            if not (isinstance(data__version, str) and data__version == '1.0.0'):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".version must be same as const definition: 1.0.0", value=data__version, name="" + (name_prefix or "data") + ".version", definition={'type': 'string', 'const': '1.0.0', 'description': 'Schema version'}, rule='const')
+        if "data" in data_keys:
+            data_keys.remove("data")
+            data__data = data["data"]
+            if not isinstance(data__data, (dict)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".data must be object", value=data__data, name="" + (name_prefix or "data") + ".data", definition={'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}, rule='type')
+            data__data_is_dict = isinstance(data__data, dict)
+            if data__data_is_dict:
+                data__data__missing_keys = set(['id', 'name']) - data__data.keys()
+                if data__data__missing_keys:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".data must contain " + (str(sorted(data__data__missing_keys)) + " properties"), value=data__data, name="" + (name_prefix or "data") + ".data", definition={'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}, rule='required')
+                data__data_keys = set(data__data.keys())
+                if "id" in data__data_keys:
+                    data__data_keys.remove("id")
+                    data__data__id = data__data["id"]
+                    if not isinstance(data__data__id, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".data.id must be string", value=data__data__id, name="" + (name_prefix or "data") + ".data.id", definition={'type': 'string', 'description': 'Unique identifier'}, rule='type')
+                if "name" in data__data_keys:
+                    data__data_keys.remove("name")
+                    data__data__name = data__data["name"]
+                    if not isinstance(data__data__name, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".data.name must be string", value=data__data__name, name="" + (name_prefix or "data") + ".data.name", definition={'type': 'string', 'minLength': 1, 'description': 'Name field'}, rule='type')
+                    if isinstance(data__data__name, str):
+                        data__data__name_len = len(data__data__name)
+                        if data__data__name_len < 1:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".data.name must be longer than or equal to 1 characters", value=data__data__name, name="" + (name_prefix or "data") + ".data.name", definition={'type': 'string', 'minLength': 1, 'description': 'Name field'}, rule='minLength')
+                if data__data_keys:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".data must not contain "+str(data__data_keys)+" properties", value=data__data, name="" + (name_prefix or "data") + ".data", definition={'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}, rule='additionalProperties')
+        if data_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must not contain "+str(data_keys)+" properties", value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'https://json-schema.org/draft/2020-12/schema', '$id': 'https://api.example.com/schemas/m1.json', 'title': 'M1 Schema', 'description': 'JSON Schema for M1 API validation', 'version': '1.0.0', 'type': 'object', 'properties': {'version': {'type': 'string', 'const': '1.0.0', 'description': 'Schema version'}, 'data': {'type': 'object', 'description': 'Main data object', 'properties': {'id': {'type': 'string', 'description': 'Unique identifier'}, 'name': {'type': 'string', 'minLength': 1, 'description': 'Name field'}}, 'required': ['id', 'name'], 'additionalProperties': False}}, 'required': ['version', 'data'], 'additionalProperties': False}, rule='additionalProperties')
+    return data
+
+validate = validate_https___api_example_com_schemas_m1_json
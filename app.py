@@ -7,13 +7,44 @@ Exposes /m1/analyze endpoint for XML analysis
 import os
 import tempfile
 import json
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-from harmonic_precision_analyzer import HarmonicPrecisionAnalyzer
-import jsonschema
-from jsonschema import validate
+from harmonic_precision_analyzer import HarmonicPrecisionAnalyzer, MUSIC21_AVAILABLE
+
+# fastjsonschema generates a specialized validator function; jsonschema is the fallback
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+try:
+    import jsonschema
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+# orjson serializes responses and parses request bodies much faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# lxml gives a fast, C-level well-formedness check before music21 parsing
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as etree
+    LXML_AVAILABLE = False
 
 # JSON response helpers
 def json_success(data=None, message=None, **kwargs):
@@ -26,164 +57,361 @@ def json_success(data=None, message=None, **kwargs):
     response.update(kwargs)
     return jsonify(response)
 
-def json_error(message, code=400, **kwargs):
-    """Standard JSON error response"""
+def json_error(message, code=400, error_code=None, **kwargs):
+    """Standard JSON error response; error_code is a stable identifier clients can match on"""
     response = {
         "status": "error",
         "error": message
     }
+    if error_code:
+        response["error_code"] = error_code
     response.update(kwargs)
     return jsonify(response), code
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's default() for other types"""
+    
+    def dumps(self, obj, **kwargs):
+        # Flask passes indent or separators; anything else goes to the stdlib provider
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 # Flask app setup
 app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+MAX_UPLOAD_BYTES = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
 
 # Configure paths
 BASE_DIR = Path(__file__).parent
-SCHEMA_PATH = BASE_DIR / "schemas" / "cannibal_child_schema.json"
+SCHEMA_PATH = BASE_DIR / "docs" / "schema_m1.json"
+
+# Schema used when SCHEMA_PATH is missing, empty or not valid JSON
+FALLBACK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "version": {"type": "string"},
+        "data": {"type": "object"}
+    }
+}
+
+def load_schema(path=SCHEMA_PATH):
+    """Load the M1 JSON schema, falling back to FALLBACK_SCHEMA on any problem"""
+    try:
+        if not path.exists():
+            return FALLBACK_SCHEMA
+        
+        with open(path, 'r', encoding='utf-8') as schema_file:
+            content = schema_file.read().strip()
+        
+        # Fallback si el schema está vacío
+        if not content:
+            return FALLBACK_SCHEMA
+        
+        schema = json.loads(content)
+        
+        # Check the schema itself once here, against its declared draft, instead of on every validation
+        if JSONSCHEMA_AVAILABLE:
+            jsonschema.validators.validator_for(schema).check_schema(schema)
+        return schema
+    
+    except Exception:
+        # Fallback si hay error leyendo, parseando JSON o el schema no es válido
+        return FALLBACK_SCHEMA
+
+def schema_sha256(schema):
+    """Stable fingerprint of a schema, recorded in the generated validator module"""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+# Schema and validator are built once at import and reused by every request
+SCHEMA = load_schema()
+
+# Module written by scripts/gen_validator.py; skips compiling the schema at startup
+VALIDATOR_MODULE = "_m1_validator"
+
+def load_generated_validator(schema):
+    """validate() from the generated validator module, or None if missing or stale for schema"""
+    try:
+        module = importlib.import_module(VALIDATOR_MODULE)
+    except ImportError:
+        return None
+    if getattr(module, 'SCHEMA_SHA256', None) != schema_sha256(schema):
+        return None
+    return module.validate
+
+def compile_fast_validator(schema):
+    """Compile schema with fastjsonschema, or None to use the jsonschema validator"""
+    if not FASTJSONSCHEMA_AVAILABLE:
+        return None
+    
+    generated = load_generated_validator(schema)
+    if generated is not None:
+        return generated
+    
+    try:
+        return fastjsonschema.compile(schema)
+    except Exception:
+        # fastjsonschema rejects some schemas jsonschema accepts
+        return None
+
+_FAST_VALIDATE = compile_fast_validator(SCHEMA)
+# Fallback validator for the draft named by $schema (2020-12 for docs/schema_m1.json)
+_VALIDATOR = (jsonschema.validators.validator_for(SCHEMA)(SCHEMA)
+              if _FAST_VALIDATE is None and JSONSCHEMA_AVAILABLE else None)
+
+def schema_errors(instance):
+    """Validation error message for instance against SCHEMA, as a list (empty when valid)"""
+    if _FAST_VALIDATE is not None:
+        try:
+            _FAST_VALIDATE(instance)
+            return []
+        except fastjsonschema.JsonSchemaException as e:
+            return [e.message]
+    
+    if _VALIDATOR is None:
+        raise RuntimeError("No JSON schema validator available (install fastjsonschema or jsonschema)")
+    # Like fastjsonschema, stop at the first error instead of walking the whole instance
+    first_error = next(_VALIDATOR.iter_errors(instance), None)
+    return [] if first_error is None else [first_error.message]
+
+# /m1/schema and /m1/version never change, so their bodies are serialized once
+_SCHEMA_BODY = app.json.dumps({"status": "success", "schema": SCHEMA}).encode('utf-8')
+_VERSION_BODY = app.json.dumps({
+    "status": "success",
+    "version": "1.0.0",
+    "module": "harmonic_precision_analyzer",
+    "endpoint": "m1"
+}).encode('utf-8')
+STATIC_MAX_AGE = 3600  # seconds clients and proxies may cache static bodies
+
+def static_json_response(body):
+    """Cacheable JSON response for a pre-serialized body, answering 304 on a matching ETag"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha256(body).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    return response.make_conditional(request)
 
 # Initialize analyzer
 analyzer = HarmonicPrecisionAnalyzer()
 
+# Set once warm_up() has run; /health answers 503 until then. warm_up() runs
+# synchronously at import below, so this only matters if it is deferred to the background
+_READY = False
+
+# Smallest score music21's MusicXML reader accepts, used only to warm it up
+_WARM_UP_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<score-partwise version="3.1"><part-list><score-part id="P1"><part-name>P</part-name>'
+    '</score-part></part-list><part id="P1"><measure number="1"><note><pitch><step>C</step>'
+    '<octave>4</octave></pitch><duration>1</duration></note></measure></part></score-partwise>'
+)
+
+def warm_up():
+    """Run the schema validator and music21's MusicXML reader once so the first request is not cold"""
+    global _READY
+    schema_errors({})
+    if MUSIC21_AVAILABLE:
+        import music21
+        try:
+            music21.converter.parseData(_WARM_UP_XML, format='musicxml')
+        except Exception:
+            # Warm-up is best effort; a real request will surface any music21 problem
+            pass
+    _READY = True
+
+warm_up()
+
+# Upload extensions accepted by /m1/analyze (MXL is zipped MusicXML)
+ALLOWED_EXTENSIONS = frozenset({'xml', 'musicxml', 'mxl'})
+
+# Root elements of the two MusicXML document types
+MUSICXML_ROOTS = frozenset({'score-partwise', 'score-timewise'})
+
+# Uploads are copied and parsed in chunks of this size, never read whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def new_pull_parser():
+    """Incremental XML parser for one upload (parsers are not shared between requests)"""
+    if LXML_AVAILABLE:
+        # Never resolve entities (no XXE), fetch DTDs or lift libxml2's size limits
+        return etree.XMLPullParser(events=('start', 'end'), resolve_entities=False,
+                                   no_network=True, huge_tree=False)
+    return etree.XMLPullParser(events=('start', 'end'))
+
+def spool_upload(stream, dest, check_xml=True, max_bytes=MAX_UPLOAD_BYTES, digest=None):
+    """Copy an upload stream into dest chunk by chunk, checking XML as it arrives
+    
+    Returns (message, status_code, error_code) when the upload is rejected, None otherwise.
+    Malformed XML, documents whose root is not a MusicXML score and oversized
+    bodies are rejected without reading the rest.
+    When given, digest (a hashlib object) is updated with every chunk.
+    """
+    parser = new_pull_parser() if check_xml else None
+    root = None
+    depth = 0
+    total = 0
+    try:
+        while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > max_bytes:
+                return "File too large", 413, "FILE_TOO_LARGE"
+            dest.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            
+            if parser is not None:
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    if event == 'start':
+                        depth += 1
+                        if root is None:
+                            if element.tag not in MUSICXML_ROOTS:
+                                return "Not a MusicXML score", 400, "NOT_MUSICXML"
+                            root = element
+                        continue
+                    depth -= 1
+                    # Empty finished elements and detach the root's children (which hold
+                    # the nested ones) so memory does not grow with the file
+                    element.clear()
+                    if depth == 1:
+                        root.remove(element)
+        
+        if parser is not None:
+            parser.close()
+    except etree.ParseError:
+        return "Malformed XML file", 400, "MALFORMED_XML"
+    
+    return None
+
+# Analysis results keyed by (extension, SHA-256 of the upload); resubmitted scores skip music21
+ANALYSIS_CACHE_SIZE = 128
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+def cached_analysis(key):
+    """Cached analysis result for key, or None"""
+    with _analysis_cache_lock:
+        result = _analysis_cache.get(key)
+        if result is not None:
+            _analysis_cache.move_to_end(key)
+        return result
+
+def store_analysis(key, result):
+    """Cache an analysis result, evicting the least recently used beyond ANALYSIS_CACHE_SIZE"""
+    with _analysis_cache_lock:
+        _analysis_cache[key] = result
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
 # Error handlers for standard HTTP errors
 @app.errorhandler(404)
 def not_found(error):
-    return json_error("Endpoint not found", 404)
+    return json_error("Endpoint not found", 404, "NOT_FOUND")
 
 @app.errorhandler(405)
 def method_not_allowed(error):
-    return json_error("Method not allowed", 405)
+    return json_error("Method not allowed", 405, "METHOD_NOT_ALLOWED")
 
 @app.errorhandler(413)
 @app.errorhandler(RequestEntityTooLarge)
 def too_large(error):
-    return json_error("File too large", 413)
+    return json_error("File too large", 413, "FILE_TOO_LARGE")
 
 # Routes
 @app.route('/health', methods=['GET'])
 @app.route('/m1/health', methods=['GET'])
 def health():
-    """Health check endpoint"""
+    """Health check endpoint - 503 until the app has warmed up"""
+    if not _READY:
+        return json_error("Service warming up", 503, "NOT_READY", health="starting")
     return jsonify({"status":"success","health":"healthy","module":"harmonic_precision_analyzer","version":"1.0.0"})
 
 @app.route('/m1/version', methods=['GET'])
 def version():
-    """Version endpoint - hardened to never return 500"""
-    try:
-        return jsonify({"status":"success","version":"1.0.0","module":"harmonic_precision_analyzer","endpoint":"m1"})
-    except Exception:
-        # Hardened fallback - should never fail
-        return jsonify({
-            "status": "success",
-            "version": "1.0.0",
-            "module": "harmonic_precision_analyzer",
-            "endpoint": "m1"
-        }), 200
+    """Version endpoint - static pre-serialized body, never returns 500"""
+    return static_json_response(_VERSION_BODY)
 
 @app.route('/m1/analyze', methods=['POST'])
 def analyze():
     """Analyze XML file for harmonic precision"""
     try:
-        # Check content type for multipart/form-data
-        if not request.content_type or not request.content_type.startswith('multipart/form-data'):
-            return json_error("Content-Type must be multipart/form-data")
-        
-        # Check if file is present
+        # Check if file is present (request.files is empty unless multipart/form-data)
         if 'file' not in request.files:
-            return json_error("No file provided")
+            return json_error("No file provided", error_code="NO_FILE")
         
         file = request.files['file']
         if file.filename == '' or not file.filename:
-            return json_error("No file provided")
+            return json_error("No file selected", error_code="EMPTY_FILENAME")
         
         if not file:
-            return json_error("No file provided")
-        
-        # Validate file extension - accept XML, MusicXML, and MXL files
-        filename_lower = file.filename.lower()
-        valid_extensions = ('.xml', '.musicxml', '.mxl')
-        if not filename_lower.endswith(valid_extensions):
-            return json_error("Invalid file type. Only XML, MusicXML, and MXL files are allowed.")
+            return json_error("No file provided", error_code="NO_FILE")
         
-        # Create secure temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as temp_file:
-            file.save(temp_file.name)
-            temp_path = Path(temp_file.name)
+        # Validate file extension before touching the body
+        _, dot, ext = file.filename.rpartition('.')
+        ext = ext.lower()
+        if not dot or ext not in ALLOWED_EXTENSIONS:
+            return json_error("Invalid file type. Only XML, MusicXML, and MXL files are allowed.",
+                              error_code="INVALID_FILE_TYPE")
         
+        # Stream the upload to disk, rejecting malformed XML early (MXL is zipped)
+        temp_path = None
+        digest = hashlib.sha256()
         try:
-            # Analyze the file using analyze_xml_precision
-            result = analyzer.analyze_xml_precision(temp_path)
+            # Keep the real extension so music21 picks the right reader for MXL
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as temp_file:
+                temp_path = Path(temp_file.name)
+                rejection = spool_upload(file.stream, temp_file, check_xml=ext != 'mxl',
+                                         digest=digest)
+            if rejection:
+                return json_error(*rejection)
             
-            return json_success({
-                "analysis": result,
-                "filename": secure_filename(file.filename),
-                "module": "harmonic_precision_analyzer"
-            })
-        
-        except Exception as e:
-            return json_error(f"Analysis error: {str(e)}")
+            try:
+                # Analyze the file using analyze_xml_precision, unless this upload was seen before
+                cache_key = (ext, digest.digest())
+                result = cached_analysis(cache_key)
+                if result is None:
+                    result = analyzer.analyze_xml_precision(temp_path)
+                    # The analyzer reports its own failures as status 'error'; those may be
+                    # transient, so only successful analyses are replayed
+                    if result.get('status') != 'error':
+                        store_analysis(cache_key, result)
+                
+                return json_success({
+                    "analysis": result,
+                    "filename": secure_filename(file.filename),
+                    "module": "harmonic_precision_analyzer"
+                })
+            
+            except Exception as e:
+                return json_error(f"Analysis error: {str(e)}", error_code="ANALYSIS_ERROR")
         
         finally:
             # Clean up temporary file
-            if temp_path.exists():
+            if temp_path is not None and temp_path.exists():
                 temp_path.unlink()
     
     except Exception as e:
-        return json_error(f"File processing error: {str(e)}")
+        return json_error(f"File processing error: {str(e)}", error_code="PROCESSING_ERROR")
 
 @app.route('/m1/schema', methods=['GET'])
 def get_schema():
     """Get JSON schema for validation"""
-    try:
-        if not SCHEMA_PATH.exists():
-            # Fallback si el schema no existe
-            fallback_schema = {
-                "type": "object",
-                "properties": {
-                    "version": {"type": "string"},
-                    "data": {"type": "object"}
-                }
-            }
-            return json_success({"schema": fallback_schema})
-        
-        with open(SCHEMA_PATH, 'r', encoding='utf-8') as schema_file:
-            content = schema_file.read().strip()
-            if not content:
-                # Fallback si el schema está vacío
-                fallback_schema = {
-                    "type": "object",
-                    "properties": {
-                        "version": {"type": "string"},
-                        "data": {"type": "object"}
-                    }
-                }
-                return json_success({"schema": fallback_schema})
-            
-            schema = json.loads(content)
-        
-        return json_success({"schema": schema})
-    
-    except json.JSONDecodeError as e:
-        # Fallback si hay error parseando JSON
-        fallback_schema = {
-            "type": "object",
-            "properties": {
-                "version": {"type": "string"},
-                "data": {"type": "object"}
-            }
-        }
-        return json_success({"schema": fallback_schema})
-    except Exception as e:
-        # Fallback para cualquier otro error
-        fallback_schema = {
-            "type": "object",
-            "properties": {
-                "version": {"type": "string"},
-                "data": {"type": "object"}
-            }
-        }
-        return json_success({"schema": fallback_schema})
+    return static_json_response(_SCHEMA_BODY)
 
 @app.route('/m1/validate', methods=['POST'])
 def validate_json():
@@ -191,62 +419,26 @@ def validate_json():
     try:
         # Check if JSON data is provided
         if not request.is_json:
-            return json_error('Request must contain valid JSON')
-        
-        json_data = request.get_json()
-        if json_data is None:
-            return json_error('Request must contain valid JSON')
+            return json_error('Request must contain valid JSON', error_code='INVALID_JSON')
         
-        # Load schema with fallbacks
+        # Parse the raw body directly; cache=False keeps Flask from holding a second copy
+        raw = request.get_data(cache=False)
         try:
-            if not SCHEMA_PATH.exists():
-                fallback_schema = {
-                    "type": "object",
-                    "properties": {
-                        "version": {"type": "string"},
-                        "data": {"type": "object"}
-                    }
-                }
-                schema = fallback_schema
-            else:
-                with open(SCHEMA_PATH, 'r', encoding='utf-8') as schema_file:
-                    content = schema_file.read().strip()
-                    if not content:
-                        fallback_schema = {
-                            "type": "object",
-                            "properties": {
-                                "version": {"type": "string"},
-                                "data": {"type": "object"}
-                            }
-                        }
-                        schema = fallback_schema
-                    else:
-                        schema = json.loads(content)
-        
-        except (json.JSONDecodeError, FileNotFoundError):
-            fallback_schema = {
-                "type": "object",
-                "properties": {
-                    "version": {"type": "string"},
-                    "data": {"type": "object"}
-                }
-            }
-            schema = fallback_schema
+            json_data = app.json.loads(raw) if raw else None
+        except ValueError:
+            json_data = None
+        if json_data is None:
+            return json_error('Request must contain valid JSON', error_code='INVALID_JSON')
         
-        # Validate JSON against schema
-        try:
-            validate(instance=json_data, schema=schema)
+        # Validate JSON against the precompiled schema validator
+        all_errors = schema_errors(json_data)
+        if not all_errors:
             return json_success({"valid": True, "message": "Valid JSON according to schema"})
         
-        except jsonschema.ValidationError as ve:
-            # Collect all validation errors
-            validator = jsonschema.Draft7Validator(schema)
-            all_errors = [str(error) for error in validator.iter_errors(json_data)]
-            
-            return json_error('Invalid JSON according to schema', 422, valid=False, validation_errors=all_errors if all_errors else [str(ve)])
+        return json_error('Invalid JSON according to schema', 422, 'SCHEMA_MISMATCH', valid=False, validation_errors=all_errors)
     
     except Exception as e:
-        return json_error(f'Validation error: {str(e)}', 500)
+        return json_error(f'Validation error: {str(e)}', 500, 'VALIDATION_ERROR')
 
 if __name__ == '__main__':
     # Development server configuration
@@ -5,13 +5,14 @@ from datetime import datetime
 from pathlib import Path
 import logging
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from collections import defaultdict
 import xml.etree.ElementTree as ET
 
 # Importaciones de análisis musical
 try:
     import music21
-    from music21 import stream, chord, note, pitch, key, analysis, interval
+    from music21 import stream, chord, note, pitch, key, analysis, interval, harmony
     MUSIC21_AVAILABLE = True
 except ImportError:
     MUSIC21_AVAILABLE = False
@@ -47,7 +48,8 @@ PRECISION_CONFIG = {
     "cross_validation_required": True, # validación cruzada obligatoria
     "bass_validation_weight": 0.7,    # peso del bajo en validación modal
     "harmonic_accuracy_threshold": 0.98, # precisión harmónica mínima
-    "temporal_accuracy_threshold": 0.95   # precisión temporal mínima
+    "temporal_accuracy_threshold": 0.95,  # precisión temporal mínima
+    "bass_validation_max_samples": 512    # fundamentales comparados como máximo (None = exacto)
 }
 
 # Vocabulario de acordes específico para metal progresivo
@@ -58,6 +60,98 @@ METAL_CHORD_VOCABULARY = {
     'metal_specific': ['dim', 'aug', 'maj7#11', 'min(maj7)']
 }
 
+# Prefijos de nombre de parte -> grupo instrumental usado por los validadores
+INSTRUMENT_GROUP_PREFIXES = {
+    'guitar': 'guitar',
+    'bass': 'bass'
+}
+
+# Timeline harmónico estructurado para extracción vectorizada de segmentos
+_TIMELINE_DTYPE = np.dtype([
+    ('time', np.float64),
+    ('quality', np.int8),
+    ('root', np.int8),
+    ('symbol', object)
+])
+
+# Códigos de calidad de acorde (0 = otra/desconocida)
+_QUALITY_CODES = {
+    'power': 1,
+    'minor': 2,
+    'diminished': 3,
+    'major': 4
+}
+
+# Tensión harmónica indexada por código de calidad
+_TENSION_ARR = np.full(16, 0.5)
+_TENSION_ARR[_QUALITY_CODES['power']] = 0.3
+_TENSION_ARR[_QUALITY_CODES['minor']] = 0.7
+_TENSION_ARR[_QUALITY_CODES['diminished']] = 0.7
+_TENSION_ARR[_QUALITY_CODES['major']] = 0.4
+
+def _chord_quality(chord_element: chord.Chord) -> str:
+    """
+    Determina la calidad del acorde con precisión.
+    """
+    try:
+        # Usar análisis de music21
+        quality = chord_element.quality
+        return str(quality)
+    except:
+        # Análisis manual por intervalos
+        notes = [n.pitch.midi for n in chord_element.notes]
+        if len(notes) < 2:
+            return 'unknown'
+        
+        # Calcular intervalos desde la fundamental
+        intervals = [(note - notes[0]) % 12 for note in notes[1:]]
+        
+        # Detectar calidades comunes
+        if 3 in intervals and 7 in intervals:
+            return 'minor'
+        elif 4 in intervals and 7 in intervals:
+            return 'major'
+        elif 7 in intervals and len(intervals) == 1:
+            return 'power'
+        elif 6 in intervals:
+            return 'diminished'
+        elif 8 in intervals:
+            return 'augmented'
+        
+        return 'unknown'
+
+# Valor que devuelve music21 cuando no reconoce el cifrado de un acorde
+_UNIDENTIFIED_CHORD_SYMBOL = 'Chord Symbol Cannot Be Identified'
+
+@lru_cache(maxsize=4096)
+def _describe_chord(pitch_names: Tuple[str, ...]) -> Optional[Tuple[str, str, str, int]]:
+    """
+    Símbolo, fundamental, calidad e inversión de un acorde dado por sus alturas.
+    
+    El cifrado (p. ej. 'Am', 'Cmaj7', 'D/F#') sale de
+    harmony.chordSymbolFigureFromChord, que cuesta varios milisegundos por
+    acorde; como la música es muy repetitiva, se memoiza por tupla de alturas.
+    Si music21 no reconoce el cifrado se usa su nombre común. Los fallos
+    también se memoizan (None) para no repetirlos.
+    """
+    try:
+        chord_element = chord.Chord(list(pitch_names))
+        symbol = harmony.chordSymbolFigureFromChord(chord_element)
+        if symbol == _UNIDENTIFIED_CHORD_SYMBOL:
+            symbol = chord_element.pitchedCommonName
+        return (
+            symbol,
+            chord_element.root().name,
+            _chord_quality(chord_element),
+            chord_element.inversion()
+        )
+    except Exception:
+        return None
+
+def _chord_key(chord_element: chord.Chord) -> Tuple[str, ...]:
+    """Clave hashable de un acorde: sus alturas con octava, en orden."""
+    return tuple(p.nameWithOctave for p in chord_element.pitches)
+
 @dataclass
 class InstrumentalPart:
     """Parte instrumental individual con análisis específico"""
@@ -152,12 +246,18 @@ class HarmonicPrecisionAnalyzer:
             for instrument, part in instrumental_parts.items():
                 individual_analyses[instrument] = self._analyze_instrumental_part(part, instrument)
             
+            # Agrupar partes por instrumento una sola vez; el bajo de referencia es
+            # la primera parte 'bass*', tanto para la detección modal como para la validación
+            part_groups = self._group_instrumental_parts(individual_analyses)
+            bass_keys = part_groups['bass']
+            bass_analysis = individual_analyses[bass_keys[0]] if bass_keys else None
+            
             # 4. Síntesis harmónica global con validación
             global_harmony = self._synthesize_harmonic_context(individual_analyses)
             
             # 5. Detección modal con validación por bajo
             modal_analysis = self._detect_modal_centers_with_bass_validation(
-                global_harmony, individual_analyses.get('bass')
+                global_harmony, bass_analysis
             )
             
             # 6. Análisis funcional preciso
@@ -167,7 +267,7 @@ class HarmonicPrecisionAnalyzer:
             
             # 7. Validación cruzada obligatoria
             cross_validation = self._perform_cross_validation(
-                individual_analyses, global_harmony, modal_analysis
+                individual_analyses, part_groups, bass_analysis, global_harmony, modal_analysis
             )
             
             # 8. Verificar umbral de precisión
@@ -199,7 +299,9 @@ class HarmonicPrecisionAnalyzer:
                     }
                     for instrument, analysis in individual_analyses.items()
                 },
-                "global_harmonic_structure": global_harmony,
+                "global_harmonic_structure": {
+                    name: value for name, value in global_harmony.items() if name != 'timeline_array'
+                },
                 "modal_analysis": modal_analysis,
                 "functional_analysis": functional_analysis,
                 "temporal_segments": temporal_segments,
@@ -462,10 +564,10 @@ class HarmonicPrecisionAnalyzer:
         
         # Análisis de acordes completos
         try:
-            chord_symbol = chord_element.figure
-            root = chord_element.root().name
-            quality = self._determine_chord_quality(chord_element)
-            inversion = chord_element.inversion()
+            description = _describe_chord(_chord_key(chord_element))
+            if description is None:
+                raise ValueError("Acorde no reconocido")
+            chord_symbol, root, quality, inversion = description
             
             return {
                 'symbol': chord_symbol,
@@ -514,10 +616,10 @@ class HarmonicPrecisionAnalyzer:
         Detector de acordes genérico para otros instrumentos.
         """
         try:
-            chord_symbol = chord_element.figure
-            root = chord_element.root().name
-            quality = self._determine_chord_quality(chord_element)
-            inversion = chord_element.inversion()
+            description = _describe_chord(_chord_key(chord_element))
+            if description is None:
+                raise ValueError("Acorde no reconocido")
+            chord_symbol, root, quality, inversion = description
             
             return {
                 'symbol': chord_symbol,
@@ -540,32 +642,7 @@ class HarmonicPrecisionAnalyzer:
         """
         Determina la calidad del acorde con precisión.
         """
-        try:
-            # Usar análisis de music21
-            quality = chord_element.quality
-            return str(quality)
-        except:
-            # Análisis manual por intervalos
-            notes = [n.pitch.midi for n in chord_element.notes]
-            if len(notes) < 2:
-                return 'unknown'
-            
-            # Calcular intervalos desde la fundamental
-            intervals = [(note - notes[0]) % 12 for note in notes[1:]]
-            
-            # Detectar calidades comunes
-            if 3 in intervals and 7 in intervals:
-                return 'minor'
-            elif 4 in intervals and 7 in intervals:
-                return 'major'
-            elif 7 in intervals and len(intervals) == 1:
-                return 'power'
-            elif 6 in intervals:
-                return 'diminished'
-            elif 8 in intervals:
-                return 'augmented'
-            
-            return 'unknown'
+        return _chord_quality(chord_element)
     
     def _analyze_guitar_voicing(self, notes: List[pitch.Pitch]) -> str:
         """
@@ -691,7 +768,9 @@ class HarmonicPrecisionAnalyzer:
             'harmonic_complexity': harmonic_complexity,
             'total_chords': len(global_chords),
             'total_notes': len(global_notes),
-            'harmonic_timeline': self._create_harmonic_timeline(global_chords)
+            'harmonic_timeline': self._create_harmonic_timeline(global_chords),
+            # Versión estructurada para los segmentos; no se incluye en la salida JSON
+            'timeline_array': self._build_timeline_array(global_chords)
         }
     
     def _detect_modal_centers_with_bass_validation(self, global_harmony: Dict, bass_analysis: Optional[InstrumentalPart]) -> Dict:
@@ -788,6 +867,18 @@ class HarmonicPrecisionAnalyzer:
         
         return total_score / max(total_weight, 1.0) / max(modal_profile)
     
+    @cached_property
+    def _rotated_profiles(self) -> np.ndarray:
+        """
+        Las 12 rotaciones de cada perfil modal, forma (n_modos, 12, 12).
+        
+        Se construye una sola vez por analizador, en el primer uso.
+        """
+        return np.array([
+            [np.roll(profile, center) for center in range(12)]
+            for profile in self.modal_profiles.values()
+        ], dtype=np.float64)
+    
     def _reanalyze_with_bass_weight(self, modal_analysis: Dict, bass_fundamentals: List[Dict]) -> Dict:
         """
         Re-análisis modal con peso hacia fundamentales de bajo.
@@ -803,25 +894,31 @@ class HarmonicPrecisionAnalyzer:
         if np.sum(bass_histogram) > 0:
             bass_histogram = bass_histogram / np.sum(bass_histogram)
         
+        # Correlación de Pearson contra todas las rotaciones de todos los modos a la vez
+        profiles = self._rotated_profiles - self._rotated_profiles.mean(axis=2, keepdims=True)
+        histogram = bass_histogram - bass_histogram.mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlations = (profiles @ histogram) / np.sqrt(
+                (profiles ** 2).sum(axis=2) * (histogram ** 2).sum()
+            )
+        
+        # Recorrer en orden (centro, modo) para conservar el desempate por primer máximo;
+        # perfiles permutados empatan salvo error de redondeo
+        correlations = np.nan_to_num(correlations.T, nan=-np.inf).ravel()
+        best_index = int(np.flatnonzero(correlations >= correlations.max() - 1e-12)[0])
+        
         # Encontrar el mejor centro modal basado en fundamentales de bajo
         best_center = None
         best_score = 0.0
         
-        for center in range(12):
-            for mode_name, profile in self.modal_profiles.items():
-                # Rotar perfil modal al centro
-                rotated_profile = np.roll(profile, center)
-                
-                # Calcular correlación con fundamentales de bajo
-                correlation = np.corrcoef(bass_histogram, rotated_profile)[0, 1]
-                
-                if not np.isnan(correlation) and correlation > best_score:
-                    best_score = correlation
-                    best_center = {
-                        'center': self._midi_to_note_name(center),
-                        'mode': mode_name,
-                        'confidence': correlation
-                    }
+        if correlations[best_index] > best_score:
+            center, mode_index = divmod(best_index, len(self.modal_profiles))
+            best_score = float(correlations[best_index])
+            best_center = {
+                'center': self._midi_to_note_name(center),
+                'mode': list(self.modal_profiles)[mode_index],
+                'confidence': best_score
+            }
         
         return {
             'predicted_centers': [best_center] if best_center else [],
@@ -830,30 +927,39 @@ class HarmonicPrecisionAnalyzer:
             'confidence': best_score
         }
     
-    def _perform_cross_validation(self, individual_analyses: Dict[str, InstrumentalPart], 
+    def _perform_cross_validation(self, individual_analyses: Dict[str, InstrumentalPart],
+                                part_groups: Dict[str, List[str]],
+                                bass_analysis: Optional[InstrumentalPart],
                                 global_harmony: Dict, modal_analysis: Dict) -> ValidationResult:
         """
         Validación cruzada obligatoria entre análisis individuales y globales.
+        
+        part_groups y bass_analysis vienen de analyze_xml_precision, que resuelve
+        el bajo una sola vez para la detección modal y para esta validación.
         """
         validation_errors = []
         
+        guitar_parts = {k: individual_analyses[k] for k in part_groups['guitar']}
+        
         # 1. Validación harmónica entre guitarras
-        harmonic_match = self._validate_guitar_harmony_consistency(individual_analyses)
+        harmonic_match = self._validate_guitar_harmony_consistency(guitar_parts)
         
         # 2. Validación temporal entre todas las partes
         timing_accuracy = self._validate_temporal_alignment(individual_analyses)
         
         # 3. Validación de fundamentales de bajo vs análisis global
         bass_fundamental_match = self._validate_bass_fundamentals(
-            individual_analyses.get('bass'), global_harmony
+            bass_analysis, global_harmony
         )
         
         # 4. Validación de coherencia modal
         modal_coherence = self._validate_modal_coherence(modal_analysis, individual_analyses)
         
         # Calcular precisión general
-        precision_scores = [harmonic_match, timing_accuracy, bass_fundamental_match, modal_coherence]
-        overall_precision = np.mean([score for score in precision_scores if score is not None])
+        precision_scores = [score for score in (harmonic_match, timing_accuracy, bass_fundamental_match, modal_coherence)
+                            if score is not None]
+        # Sin ningún validador aplicable no hay precisión que promediar
+        overall_precision = sum(precision_scores) / len(precision_scores) if precision_scores else 0.0
         
         # Determinar si la validación pasó
         validation_passed = overall_precision >= self.precision_threshold
@@ -871,12 +977,24 @@ class HarmonicPrecisionAnalyzer:
             error_details=validation_errors
         )
     
-    def _validate_guitar_harmony_consistency(self, individual_analyses: Dict[str, InstrumentalPart]) -> Optional[float]:
+    def _group_instrumental_parts(self, individual_analyses: Dict[str, InstrumentalPart]) -> Dict[str, List[str]]:
         """
-        Valida consistencia harmónica entre guitarras.
+        Agrupa los nombres de parte por tipo de instrumento en una sola pasada.
         """
-        guitar_parts = {k: v for k, v in individual_analyses.items() if k.startswith('guitar')}
+        groups = {group: [] for group in set(INSTRUMENT_GROUP_PREFIXES.values())}
+        
+        for name in individual_analyses:
+            for prefix, group in INSTRUMENT_GROUP_PREFIXES.items():
+                if name.startswith(prefix):
+                    groups[group].append(name)
+                    break
         
+        return groups
+    
+    def _validate_guitar_harmony_consistency(self, guitar_parts: Dict[str, InstrumentalPart]) -> Optional[float]:
+        """
+        Valida consistencia harmónica entre guitarras.
+        """
         if len(guitar_parts) < 2:
             return None
         
@@ -938,18 +1056,26 @@ class HarmonicPrecisionAnalyzer:
         if not global_progression:
             return None
         
+        # Submuestrear con paso fijo para acotar el coste en partituras largas
+        max_samples = self.config.get('bass_validation_max_samples')
+        if max_samples and len(bass_fundamentals) > max_samples:
+            step = -(-len(bass_fundamentals) // max_samples)
+            bass_fundamentals = bass_fundamentals[::step]
+        
+        # Encontrar acorde global más cercano en tiempo (la progresión está ordenada)
+        chord_times = np.array([chord.get('start_time', 0) for chord in global_progression], dtype=np.float64)
+        bass_times = np.array([fund['time'] for fund in bass_fundamentals], dtype=np.float64)
+        closest_indices = self._find_closest_chord_indices(chord_times, bass_times)
+        
         # Comparar fundamentales de bajo con roots de progresión global
         matches = 0
         total_comparisons = 0
         
-        for bass_fund in bass_fundamentals:
+        for bass_fund, chord_index in zip(bass_fundamentals, closest_indices):
             bass_pitch = bass_fund['pitch']
-            bass_time = bass_fund['time']
+            closest_chord = global_progression[chord_index]
             
-            # Encontrar acorde global más cercano en tiempo
-            closest_chord = self._find_closest_chord_by_time(global_progression, bass_time)
-            
-            if closest_chord and closest_chord.get('root'):
+            if closest_chord.get('root'):
                 total_comparisons += 1
                 if self._pitches_equivalent(bass_pitch, closest_chord['root']):
                     matches += 1
@@ -992,23 +1118,23 @@ class HarmonicPrecisionAnalyzer:
         except:
             return pitch1.replace('#', '').replace('b', '') == pitch2.replace('#', '').replace('b', '')
     
-    def _find_closest_chord_by_time(self, chord_progression: List[Dict], target_time: float) -> Optional[Dict]:
-        """Encuentra el acorde más cercano en tiempo."""
-        if not chord_progression:
-            return None
+    def _find_closest_chord_indices(self, chord_times: np.ndarray, target_times: np.ndarray) -> np.ndarray:
+        """
+        Índices de los acordes más cercanos en tiempo (chord_times ordenado, no vacío).
         
-        closest_chord = None
-        min_distance = float('inf')
+        En empate gana el primer acorde, como en un recorrido lineal.
+        """
+        right = np.searchsorted(chord_times, target_times, side='left')
+        left = np.maximum(right - 1, 0)
+        right_clipped = np.minimum(right, len(chord_times) - 1)
         
-        for chord in chord_progression:
-            chord_time = chord.get('start_time', 0)
-            distance = abs(chord_time - target_time)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_chord = chord
+        use_left = (right == len(chord_times)) | (
+            (right > 0) & (target_times - chord_times[left] <= chord_times[right_clipped] - target_times)
+        )
+        # Primera aparición del tiempo elegido a la izquierda
+        left = np.searchsorted(chord_times, chord_times[left], side='left')
         
-        return closest_chord
+        return np.where(use_left, left, right_clipped)
     
     def _calculate_progression_similarity(self, prog1: List[str], prog2: List[str]) -> float:
         """Calcula similitud entre dos progresiones de acordes."""
@@ -1079,17 +1205,14 @@ class HarmonicPrecisionAnalyzer:
         if len(fundamentals) < 2:
             return {'movement_type': 'static', 'average_interval': 0}
         
-        intervals = []
-        for i in range(1, len(fundamentals)):
-            interval = abs(fundamentals[i]['midi'] - fundamentals[i-1]['midi'])
-            intervals.append(interval)
-        
-        avg_interval = np.mean(intervals) if intervals else 0
+        # Intervalos entre fundamentales consecutivos en una sola operación
+        intervals = np.abs(np.diff([fund['midi'] for fund in fundamentals]))
+        avg_interval = intervals.mean()
         
         return {
             'movement_type': 'stepwise' if avg_interval <= 2 else 'leaping' if avg_interval <= 7 else 'wide',
             'average_interval': avg_interval,
-            'total_movement': sum(intervals)
+            'total_movement': int(intervals.sum())
         }
     
     def _analyze_harmonic_support_function(self, fundamentals: List[Dict]) -> str:
@@ -1150,6 +1273,30 @@ class HarmonicPrecisionAnalyzer:
             for chord in chords
         ]
     
+    def _build_timeline_array(self, chords: List[Dict]) -> np.ndarray:
+        """
+        Timeline estructurado (tiempo, calidad, fundamental, símbolo), ordenado
+        por tiempo, que usan los segmentos para búsqueda binaria y tensión vectorizada.
+        """
+        timeline = np.empty(len(chords), dtype=_TIMELINE_DTYPE)
+        for i, chord in enumerate(chords):
+            timeline[i] = (
+                chord.get('start_time', 0),
+                _QUALITY_CODES.get(chord.get('quality', 'unknown'), 0),
+                self._root_to_pitch_class(chord.get('root', 'unknown')),
+                chord.get('symbol', 'unknown')
+            )
+        
+        # searchsorted requiere orden por tiempo; el orden estable conserva los empates
+        return timeline[np.argsort(timeline['time'], kind='stable')]
+    
+    def _root_to_pitch_class(self, root: str) -> int:
+        """Convierte una fundamental a pitch class (-1 si es desconocida)."""
+        try:
+            return pitch.Pitch(root).pitchClass
+        except:
+            return -1
+    
     def _detect_modal_centers_initial(self, global_harmony: Dict) -> Dict:
         """Detección modal inicial basada en contenido harmónico."""
         # Implementación simplificada - retorna análisis base
@@ -1173,7 +1320,7 @@ class HarmonicPrecisionAnalyzer:
         # Factor de completitud del análisis
         analysis_completeness = len([v for v in harmonic_analysis.values() if v is not None]) / len(harmonic_analysis)
         
-        return np.mean([note_factor, chord_factor, analysis_completeness])
+        return (note_factor + chord_factor + analysis_completeness) / 3.0
     
     def _generate_precision_segments(self, score: stream.Score, individual_analyses: Dict, 
                                    global_harmony: Dict, modal_analysis: Dict, 
@@ -1233,7 +1380,7 @@ class HarmonicPrecisionAnalyzer:
             mode=segment_modal.get('mode', 'phrygian'),
             confidence=segment_modal.get('confidence', 0.8),
             precision_score=segment_validation.get('precision', 0.8),
-            chord_progression=[chord.get('symbol', 'unknown') for chord in segment_chords],
+            chord_progression=segment_chords['symbol'].tolist(),
             harmonic_tension=self._calculate_segment_tension(segment_chords),
             modal_interchanges=[],  # Implementación futura
             functional_analysis=[],  # Implementación futura
@@ -1250,20 +1397,21 @@ class HarmonicPrecisionAnalyzer:
             return centers[0]
         return {'center': 'E', 'mode': 'phrygian', 'confidence': 0.8}
     
-    def _extract_segment_chords(self, start_time: float, end_time: float, global_harmony: Dict) -> List[Dict]:
-        """Extrae acordes dentro de un segmento temporal."""
-        timeline = global_harmony.get('harmonic_timeline', [])
-        segment_chords = []
+    def _extract_segment_chords(self, start_time: float, end_time: float, global_harmony: Dict) -> np.ndarray:
+        """
+        Extrae acordes dentro de un segmento temporal (vista de global_harmony['timeline_array']).
         
-        for chord_event in timeline:
-            chord_time = chord_event.get('time', 0)
-            if start_time <= chord_time < end_time:
-                segment_chords.append(chord_event)
+        Un global_harmony sin timeline estructurado se trata como vacío.
+        """
+        timeline = global_harmony.get('timeline_array')
+        if timeline is None:
+            timeline = np.empty(0, dtype=_TIMELINE_DTYPE)
+        start_idx, end_idx = np.searchsorted(timeline['time'], [start_time, end_time], side='left')
         
-        return segment_chords
+        return timeline[start_idx:end_idx]
     
     def _validate_segment_precision(self, start_time: float, end_time: float, 
-                                  individual_analyses: Dict, segment_chords: List[Dict]) -> Dict:
+                                  individual_analyses: Dict, segment_chords: np.ndarray) -> Dict:
         """Valida precisión de un segmento específico."""
         return {
             'precision': 0.85,  # Implementación simplificada
@@ -1271,25 +1419,13 @@ class HarmonicPrecisionAnalyzer:
             'timing_precision': 0.95
         }
     
-    def _calculate_segment_tension(self, segment_chords: List[Dict]) -> float:
+    def _calculate_segment_tension(self, segment_chords: np.ndarray) -> float:
         """Calcula tensión harmónica del segmento."""
-        if not segment_chords:
+        if len(segment_chords) == 0:
             return 0.0
         
         # Implementación simplificada basada en tipos de acordes
-        tension_scores = []
-        for chord in segment_chords:
-            quality = chord.get('quality', 'unknown')
-            if quality == 'power':
-                tension_scores.append(0.3)
-            elif quality in ['minor', 'diminished']:
-                tension_scores.append(0.7)
-            elif quality in ['major']:
-                tension_scores.append(0.4)
-            else:
-                tension_scores.append(0.5)
-        
-        return np.mean(tension_scores)
+        return float(_TENSION_ARR[segment_chords['quality']].mean())
     
     def _analyze_harmonic_functions_precision(self, global_harmony: Dict, modal_analysis: Dict) -> Dict:
         """
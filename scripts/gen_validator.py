@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Generate _m1_validator.py from docs/schema_m1.json with fastjsonschema.compile_to_code
+app.py imports the generated module instead of compiling the schema at startup,
+as long as its SCHEMA_SHA256 matches the schema. Run again whenever the schema changes:
+
+    python scripts/gen_validator.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import fastjsonschema
+from fastjsonschema import RefResolver
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app import SCHEMA, SCHEMA_PATH, VALIDATOR_MODULE, schema_sha256
+
+HEADER = '''# Generated by scripts/gen_validator.py from {source} - do not edit.
+# Regenerate with: python scripts/gen_validator.py
+SCHEMA_SHA256 = "{digest}"
+'''
+
+def generate(schema=SCHEMA):
+    """Source of the validator module for schema, exposing it as validate()"""
+    code = fastjsonschema.compile_to_code(schema)
+    entry_point = RefResolver.from_schema(schema).get_scope_name()
+    header = HEADER.format(source=SCHEMA_PATH.relative_to(ROOT_DIR).as_posix(),
+                           digest=schema_sha256(schema))
+    return f"{header}{code}\n\nvalidate = {entry_point}\n"
+
+def main(argv=None):
+    # No options; parsing still answers --help and rejects stray arguments before writing
+    argparse.ArgumentParser(description=__doc__,
+                            formatter_class=argparse.RawDescriptionHelpFormatter).parse_args(argv)
+    target = ROOT_DIR / f"{VALIDATOR_MODULE}.py"
+    target.write_text(generate(), encoding='utf-8')
+    print(f"Wrote {target.relative_to(ROOT_DIR)}")
+
+if __name__ == '__main__':
+    main()
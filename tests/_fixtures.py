@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared test helpers for the Harmonic Precision Analyzer test suite
+Chunked upload streams and the EnvironBuilder-based upload helper
+"""
+from io import BytesIO
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import EnvironBuilder
+
+class ChunkedBytes:
+    """Read-only file-like object that hands out bytes in bounded chunks
+    
+    Lets upload tests stream a body the way a real client would. The payload
+    is wrapped in a memoryview rather than copied up front; each read copies
+    only the chunk it returns, as bytes.
+    """
+    
+    def __init__(self, data, chunk_size=4096):
+        self._view = memoryview(data)
+        self._pos = 0
+        self.chunk_size = chunk_size
+        self.closed = False
+    
+    def read(self, size=-1):
+        """Return the rest of the data, or at most min(size, chunk_size) bytes"""
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = self._pos + min(size, self.chunk_size)
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos += len(chunk)
+        return chunk
+    
+    def close(self):
+        self.closed = True
+
+
+def post_file(client, path, data=None, filename=None, field='file'):
+    """POST one upload to path, building the request with EnvironBuilder
+    
+    data may be bytes or a readable stream. With data None no file is attached.
+    """
+    builder = EnvironBuilder(method='POST', path=path)
+    if data is not None:
+        stream = BytesIO(data) if isinstance(data, bytes) else data
+        builder.files.add_file(field, FileStorage(stream=stream, filename=filename, name=field))
+    try:
+        return client.open(builder)
+    finally:
+        builder.close()
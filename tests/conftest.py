@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the Harmonic Precision Analyzer test suite
+Flask test client, sample MusicXML bytes and the sample JSON output
+"""
+import pytest
+import functools
+import sys
+from pathlib import Path
+
+# orjson parses faster; json.loads accepts bytes too
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+# Add parent directory to path once so test modules can import app and the analyzer
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR.parent))
+
+from app import app as _app, _FAST_VALIDATE
+
+DATA_DIR = TESTS_DIR / 'data'
+SAMPLE_OUTPUT_PATH = DATA_DIR / 'sample_output_ok.json'
+SAMPLE_XML_PATH = DATA_DIR / 'sample.xml'
+
+@functools.lru_cache(maxsize=1)
+def load_sample_bytes():
+    """Raw bytes of tests/data/sample_output_ok.json (read once)"""
+    return SAMPLE_OUTPUT_PATH.read_bytes()
+
+@functools.lru_cache(maxsize=1)
+def load_sample_json():
+    """Load sample JSON from tests/data/sample_output_ok.json (parsed once, read-only)"""
+    return orjson.loads(load_sample_bytes())
+
+@pytest.fixture(scope="session")
+def app():
+    """The Flask application under test"""
+    return _app
+
+@pytest.fixture(scope="session", autouse=True)
+def testing_config(app):
+    """Put the Flask app in testing mode once for the whole session"""
+    app.config['TESTING'] = True
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Create a test client for the Flask app, shared by the whole session"""
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def sample_xml_bytes():
+    """Minimal one-note MusicXML score from tests/data/sample.xml, read once"""
+    return SAMPLE_XML_PATH.read_bytes()
+
+@pytest.fixture(scope="session")
+def sample_output_body():
+    """tests/data/sample_output_ok.json as a ready-to-post request body"""
+    return load_sample_bytes()
+
+@pytest.fixture(scope="session")
+def sample_output():
+    """Parsed tests/data/sample_output_ok.json (read-only)"""
+    return load_sample_json()
+
+@pytest.fixture(scope="session")
+def validate():
+    """The compiled schema validator /m1/validate uses (raises JsonSchemaException on invalid data)"""
+    if _FAST_VALIDATE is None:
+        pytest.skip("fastjsonschema validator not available")
+    return _FAST_VALIDATE
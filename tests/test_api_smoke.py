@@ -4,167 +4,161 @@ Smoke tests for Harmonic Precision Analyzer API using Flask test_client
 Tests basic functionality of all endpoints without network calls
 """
 import pytest
-import json
-import sys
-import os
 from io import BytesIO
-
-# Add parent directory to path to import app module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from app import app
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
-def load_sample_json():
-    """Load sample JSON from tests/data/sample_output_ok.json"""
-    data_file = os.path.join(os.path.dirname(__file__), 'data', 'sample_output_ok.json')
-    with open(data_file, 'r') as f:
-        return json.load(f)
-
-SAMPLE_XML_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
-<score-partwise version="3.1">
-  <work>
-    <work-title>Test Score</work-title>
-  </work>
-  <part-list>
-    <score-part id="P1">
-      <part-name>Piano</part-name>
-    </score-part>
-  </part-list>
-  <part id="P1">
-    <measure number="1">
-      <attributes>
-        <divisions>4</divisions>
-        <key>
-          <fifths>0</fifths>
-        </key>
-        <time>
-          <beats>4</beats>
-          <beat-type>4</beat-type>
-        </time>
-        <clef>
-          <sign>G</sign>
-          <line>2</line>
-        </clef>
-      </attributes>
-      <note>
-        <pitch>
-          <step>C</step>
-          <octave>4</octave>
-        </pitch>
-        <duration>4</duration>
-        <type>quarter</type>
-      </note>
-    </measure>
-  </part>
-</score-partwise>'''
+from _fixtures import ChunkedBytes, post_file
+import app as app_module
+from app import spool_upload
 
 def test_health_endpoint(client):
     """Test health check endpoint"""
     response = client.get('/health')
     assert response.status_code == 200
     
-    data = json.loads(response.data)
-    assert data['status'] == 'success'
-    assert data['module'] == 'harmonic_precision_analyzer'
-    assert data['version'] == '1.0.0'
+    assert response.get_json().items() >= {
+        "status": "success",
+        "module": "harmonic_precision_analyzer",
+        "version": "1.0.0"
+    }.items()
+
+def test_health_endpoint_not_ready(client, monkeypatch):
+    """Health check answers 503 until the app has warmed up"""
+    monkeypatch.setattr(app_module, '_READY', False)
+    response = client.get('/health')
+    assert response.status_code == 503
+    assert response.get_json()['error_code'] == 'NOT_READY'
 
 def test_m1_version_endpoint(client):
     """Test m1 version endpoint"""
     response = client.get('/m1/version')
     assert response.status_code == 200
     
-    data = json.loads(response.data)
-    assert data['status'] == 'success'
-    assert data['module'] == 'harmonic_precision_analyzer'
-    assert data['version'] == '1.0.0'
-    assert data['endpoint'] == 'm1'
+    assert response.get_json().items() >= {
+        "status": "success",
+        "module": "harmonic_precision_analyzer",
+        "version": "1.0.0",
+        "endpoint": "m1"
+    }.items()
 
-def test_m1_analyze_no_file(client):
-    """Test analyze endpoint with no file"""
-    response = client.post('/m1/analyze')
-    assert response.status_code == 400
+def test_m1_version_endpoint_conditional(client):
+    """Version body carries cache headers and a repeat request with its ETag gets 304"""
+    response = client.get('/m1/version')
+    assert response.headers['Cache-Control'] == 'public, max-age=3600'
+    etag = response.headers['ETag']
     
-    data = json.loads(response.data)
-    assert data['status'] == 'error'
-    assert data['error'] == 'No file provided'
+    response = client.get('/m1/version', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
 
-def test_m1_analyze_empty_file(client):
-    """Test analyze endpoint with empty file"""
-    response = client.post('/m1/analyze', data={'file': (BytesIO(b''), '')})
+@pytest.mark.parametrize("body,filename,expected_code", [
+    (None, None, 'NO_FILE'),
+    (b'', '', 'EMPTY_FILENAME'),
+    (b'test content', 'test.txt', 'INVALID_FILE_TYPE'),
+    (b'<score-partwise/>', 'xml', 'INVALID_FILE_TYPE'),
+    (b'<score-partwise><part>', 'broken.xml', 'MALFORMED_XML'),
+    (b'', 'empty.xml', 'MALFORMED_XML'),
+    (b'<html><body/></html>', 'page.xml', 'NOT_MUSICXML'),
+], ids=['no_file', 'empty_file', 'invalid_file_type', 'no_extension', 'malformed_xml',
+        'empty_body', 'not_musicxml'])
+def test_m1_analyze_rejected_uploads(client, body, filename, expected_code):
+    """Test analyze endpoint rejects missing, empty and wrongly typed uploads"""
+    response = post_file(client, '/m1/analyze', body, filename)
     assert response.status_code == 400
     
-    data = json.loads(response.data)
-    assert data['status'] == 'error'
-    assert data['error'] == 'No file selected'
+    data = response.get_json()
+    assert data.items() >= {"status": "error", "error_code": expected_code}.items()
+    assert 'error' in data
 
-def test_m1_analyze_invalid_file_type(client):
-    """Test analyze endpoint with invalid file type"""
-    response = client.post('/m1/analyze', data={
-        'file': (BytesIO(b'test content'), 'test.txt')
-    })
-    assert response.status_code == 400
-    
-    data = json.loads(response.data)
-    assert data['status'] == 'error'
-    assert data['error'] == 'Invalid file type. Only XML, MusicXML, and MXL files are allowed.'
+@pytest.fixture(scope="session", params=["test.xml", "test.musicxml"])
+def valid_analysis_response(client, sample_xml_bytes, request):
+    """Analyze the sample XML once per filename and share the response"""
+    filename = request.param
+    response = post_file(client, '/m1/analyze', ChunkedBytes(sample_xml_bytes), filename)
+    return filename, response
 
-def test_m1_analyze_valid_xml_file(client):
-    """Test analyze endpoint with valid XML file"""
-    xml_data = BytesIO(SAMPLE_XML_CONTENT.encode('utf-8'))
-    response = client.post('/m1/analyze', data={
-        'file': (xml_data, 'test.xml')
-    })
+def test_m1_analyze_valid_xml_file(valid_analysis_response):
+    """Test analyze endpoint with valid XML and .musicxml files"""
+    filename, response = valid_analysis_response
     
     # The response should be 200 for successful analysis or 400 for analysis failure
     assert response.status_code in [200, 400]
     
-    data = json.loads(response.data)
+    data = response.get_json()
     
     if response.status_code == 200:
         # Success case
-        assert data['status'] == 'success'
-        assert data['module'] == 'harmonic_precision_analyzer'
+        assert data.items() >= {
+            "status": "success",
+            "module": "harmonic_precision_analyzer",
+            "filename": filename
+        }.items()
         assert 'analysis' in data
-        assert 'filename' in data
-        assert data['filename'] == 'test.xml'
     else:
         # Error case (analyzer might fail on simple XML)
         assert data['status'] == 'error'
         assert 'error' in data
-        assert 'Analysis failed:' in data['error'] or 'Request processing failed:' in data['error']
+        assert data['error_code'] in ('ANALYSIS_ERROR', 'PROCESSING_ERROR')
 
-def test_m1_analyze_musicxml_file(client):
-    """Test analyze endpoint with .musicxml extension"""
-    xml_data = BytesIO(SAMPLE_XML_CONTENT.encode('utf-8'))
-    response = client.post('/m1/analyze', data={
-        'file': (xml_data, 'test.musicxml')
-    })
+def test_spool_upload_stops_early(sample_xml_bytes):
+    """Oversized and malformed uploads are rejected before the stream is drained"""
+    body = BytesIO()
+    assert spool_upload(BytesIO(sample_xml_bytes), body) is None
+    assert body.getvalue() == sample_xml_bytes
     
-    # The response should be 200 for successful analysis or 400 for analysis failure
-    assert response.status_code in [200, 400]
+    oversized = BytesIO(b" " * (4 * 64 * 1024))
+    assert spool_upload(oversized, BytesIO(), max_bytes=1024) == ("File too large", 413, "FILE_TOO_LARGE")
+    assert oversized.tell() < len(oversized.getvalue())
     
-    data = json.loads(response.data)
+    malformed = ChunkedBytes(b'<a></b>' + b' ' * 200000, chunk_size=1024)
+    assert spool_upload(malformed, BytesIO()) == ("Malformed XML file", 400, "MALFORMED_XML")
+
+def test_m1_analyze_reuses_cached_result(client, sample_xml_bytes, monkeypatch):
+    """Resubmitting identical content is answered from the analysis cache"""
+    calls = []
     
-    if response.status_code == 200:
-        # Success case
-        assert data['status'] == 'success'
-        assert data['module'] == 'harmonic_precision_analyzer'
-        assert 'analysis' in data
-        assert 'filename' in data
-        assert data['filename'] == 'test.musicxml'
-    else:
-        # Error case (analyzer might fail on simple XML)
-        assert data['status'] == 'error'
-        assert 'error' in data
-        assert 'Analysis failed:' in data['error'] or 'Request processing failed:' in data['error']
+    def counting_analyze(path):
+        calls.append(path)
+        return {"status": "success", "module": "harmonic_precision_analyzer"}
+    
+    monkeypatch.setattr(app_module.analyzer, 'analyze_xml_precision', counting_analyze)
+    # Content no other test posts, so results they cached are not hit
+    body = sample_xml_bytes + b'<!-- analysis cache test -->'
+    
+    responses = [post_file(client, '/m1/analyze', body, name)
+                 for name in ('first.xml', 'second.xml')]
+    
+    assert len(calls) == 1
+    first, second = (r.get_json() for r in responses)
+    assert first['analysis'] == second['analysis']
+    assert second['filename'] == 'second.xml'
+
+def test_m1_analyze_does_not_cache_failed_analysis(client, sample_xml_bytes, monkeypatch):
+    """Analyses the analyzer reports as failed are rerun on resubmission"""
+    calls = []
+    real_analyze = app_module.analyzer.analyze_xml_precision
+    
+    def counting_analyze(path):
+        calls.append(path)
+        return real_analyze(path)
+    
+    monkeypatch.setattr(app_module.analyzer, 'analyze_xml_precision', counting_analyze)
+    # The one-part sample is rejected by the analyzer's structure check
+    body = sample_xml_bytes + b'<!-- failed analysis cache test -->'
+    
+    responses = [post_file(client, '/m1/analyze', body, 'score.xml') for _ in range(2)]
+    
+    assert len(calls) == 2
+    assert all(r.get_json()['analysis']['status'] == 'error' for r in responses)
+
+def test_json_provider_serializes_analysis_types(app):
+    """The app JSON provider handles numpy values and non-string keys from the analyzer"""
+    pytest.importorskip("orjson")
+    import numpy as np
+    
+    data = app.json.loads(app.json.dumps({"score": np.float64(0.5), "counts": np.arange(3), 1: "one"}))
+    assert data == {"score": 0.5, "counts": [0, 1, 2], "1": "one"}
 
 def test_nonexistent_endpoint(client):
     """Test that nonexistent endpoints return 404"""
     response = client.get('/nonexistent')
     assert response.status_code == 404
+    assert response.get_json()['error_code'] == 'NOT_FOUND'
@@ -2,11 +2,55 @@
 # Test básico especificado por Nicolás
 
 import pytest
-import sys
-import os
+import json
+from music21 import stream, note, chord, instrument, pitch
 
-# Add the parent directory to the path to import our module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+@pytest.fixture(scope="module")
+def analyzer():
+    """Build the analyzer once per module (it keeps no per-analysis state)"""
+    from harmonic_precision_analyzer import HarmonicPrecisionAnalyzer
+    return HarmonicPrecisionAnalyzer()
+
+_PROGRESSION = [(['E3', 'B3'], 'E2'), (['A3', 'C4', 'E4'], 'A2'), (['C4', 'E4', 'G4'], 'C3')]
+
+# Parse each pitch name once; chords and notes are built from these objects
+_PITCH_CACHE = {
+    name: pitch.Pitch(name)
+    for chord_notes, bass_note in _PROGRESSION
+    for name in chord_notes + [bass_note]
+}
+
+def _measure(element):
+    """Wrap a single element in its own measure"""
+    measure = stream.Measure()
+    measure.append(element)
+    return measure
+
+def _build_guitar_bass_score():
+    """Guitar chords over a bass line, one chord per measure"""
+    guitar = stream.Part([instrument.ElectricGuitar()] + [
+        _measure(chord.Chord([_PITCH_CACHE[name] for name in chord_notes], quarterLength=4))
+        for chord_notes, _ in _PROGRESSION
+    ])
+    bass = stream.Part([instrument.ElectricBass()] + [
+        _measure(note.Note(_PITCH_CACHE[bass_note], quarterLength=4))
+        for _, bass_note in _PROGRESSION
+    ])
+    
+    score = stream.Score()
+    score.insert(0, guitar)
+    score.insert(0, bass)
+    return score
+
+# music21 scores are expensive to build; tests only read them
+_GUITAR_BASS_SCORE = _build_guitar_bass_score()
+
+@pytest.fixture(scope="module")
+def one_note_score_path(tmp_path_factory, sample_xml_bytes):
+    """Write the shared one-note MusicXML sample to a file once per module"""
+    path = tmp_path_factory.mktemp('scores') / 'one_note.musicxml'
+    path.write_bytes(sample_xml_bytes)
+    return path
 
 def test_module_import():
     """Test that the harmonic_precision_analyzer module can be imported."""
@@ -28,3 +72,141 @@ def test_placeholder():
     """Placeholder test for future M1 precision tests."""
     # This test always passes - placeholder for future implementation
     assert True
+
+def test_group_instrumental_parts(analyzer):
+    """Part names are grouped by instrument prefix in a single pass."""
+    groups = analyzer._group_instrumental_parts({
+        'guitar_1': None, 'guitar_2': None, 'bass': None, 'unknown_part': None
+    })
+    
+    assert groups['guitar'] == ['guitar_1', 'guitar_2']
+    assert groups['bass'] == ['bass']
+    assert set(groups) == {'guitar', 'bass'}
+
+def test_segment_chords_and_tension_from_timeline(analyzer):
+    """Segment extraction slices the structured timeline and tension uses chord quality."""
+    # Out of order on purpose: the array is sorted by time
+    timeline = analyzer._build_timeline_array([
+        {'start_time': 4.0, 'quality': 'major', 'root': 'C'},
+        {'start_time': 0.0, 'quality': 'power', 'root': 'E'},
+        {'start_time': 2.0, 'quality': 'minor', 'root': 'A'},
+    ])
+    # A second analysis' timeline must not leak into the first
+    other = analyzer._build_timeline_array([{'start_time': 0.0, 'quality': 'major', 'root': 'C'}])
+    
+    segment = analyzer._extract_segment_chords(0.0, 4.0, {'timeline_array': timeline})
+    assert len(segment) == 2
+    assert segment['root'].tolist() == [4, 9]
+    assert analyzer._calculate_segment_tension(segment) == pytest.approx(0.5)
+    assert analyzer._calculate_segment_tension(segment[:0]) == 0.0
+    assert analyzer._extract_segment_chords(0.0, 4.0, {'timeline_array': other})['root'].tolist() == [0]
+    # A global_harmony without the structured timeline has no chords to slice
+    assert len(analyzer._extract_segment_chords(0.0, 4.0, {'harmonic_timeline': []})) == 0
+
+def test_reanalyze_with_bass_weight_uses_rotated_profiles(analyzer):
+    """Bass-weighted reanalysis scores every (center, mode) rotation at once."""
+    assert analyzer._rotated_profiles.shape == (len(analyzer.modal_profiles), 12, 12)
+    
+    fundamentals = [{'midi': midi} for midi in (40, 40, 40, 41, 43, 45, 47)]
+    result = analyzer._reanalyze_with_bass_weight({}, fundamentals)
+    
+    assert result['predicted_centers'][0]['center'] == 'E'
+    assert 0.0 < result['confidence'] <= 1.0
+    assert analyzer._reanalyze_with_bass_weight({}, [])['predicted_centers'] == []
+
+def test_validate_bass_fundamentals_sampling():
+    """Bass validation matches the closest chord and honours the sample cap."""
+    from harmonic_precision_analyzer import HarmonicPrecisionAnalyzer, InstrumentalPart
+    
+    fundamentals = [{'pitch': 'E' if i % 2 == 0 else 'F', 'midi': 40, 'time': float(i)} for i in range(8)]
+    bass = InstrumentalPart('bass', [], [], [], {'fundamentals': fundamentals}, 1.0, 'validated')
+    progression = [{'start_time': float(i), 'root': 'E'} for i in range(8)]
+    
+    exact = HarmonicPrecisionAnalyzer({'bass_validation_max_samples': None})
+    assert exact._validate_bass_fundamentals(bass, {'global_chord_progression': progression}) == 0.5
+    
+    # With a step of 2 only the fundamentals at even times are compared (all E)
+    sampled = HarmonicPrecisionAnalyzer({'bass_validation_max_samples': 4})
+    assert sampled._validate_bass_fundamentals(bass, {'global_chord_progression': progression}) == 1.0
+
+def test_cross_validation_without_applicable_validators(analyzer, monkeypatch):
+    """No applicable validator yields zero precision instead of dividing by zero."""
+    for validator in ('_validate_guitar_harmony_consistency', '_validate_temporal_alignment',
+                      '_validate_bass_fundamentals', '_validate_modal_coherence'):
+        monkeypatch.setattr(analyzer, validator, lambda *args: None)
+    
+    result = analyzer._perform_cross_validation({}, {'guitar': [], 'bass': []}, None, {}, {})
+    assert result.overall_precision == 0.0
+    assert result.validation_passed is False
+
+def test_json_output_format(analyzer, one_note_score_path):
+    """Analysis output is JSON serializable and carries the standard fields."""
+    result = analyzer.analyze_xml_precision(one_note_score_path)
+    
+    # A single-part score is rejected by the structure check
+    assert result['status'] == 'error'
+    assert result['module'] == 'harmonic_precision_analyzer'
+    assert result['validation_passed'] is False
+    assert json.loads(json.dumps(result))['error'] == result['error']
+
+def test_extract_instrumental_parts(analyzer):
+    """Guitar and bass parts are detected from a two-part score."""
+    assert analyzer._validate_score_structure(_GUITAR_BASS_SCORE)
+    
+    parts = analyzer._extract_instrumental_parts(_GUITAR_BASS_SCORE)
+    assert list(parts) == ['guitar_1', 'bass']
+    
+    chords = analyzer._extract_chords_with_voicing(parts['guitar_1'], 'guitar_1')
+    assert [c['root'] for c in chords] == ['E', 'A', 'C']
+    assert [c['chord_symbol'] for c in chords] == ['E5', 'Am', 'C']
+    assert chords[0]['quality'] == 'power'
+
+def test_bass_part_shared_by_modal_detection_and_cross_validation(analyzer, monkeypatch):
+    """A bass part not named exactly 'bass' feeds both modal detection and cross-validation."""
+    parts = analyzer._extract_instrumental_parts(_GUITAR_BASS_SCORE)
+    renamed = {'guitar_1': parts['guitar_1'], 'bass_1': parts['bass']}
+    monkeypatch.setattr(analyzer, '_load_guitar_pro_xml', lambda path: _GUITAR_BASS_SCORE)
+    monkeypatch.setattr(analyzer, '_extract_instrumental_parts', lambda score: renamed)
+    
+    seen = {}
+    detect_modal = analyzer._detect_modal_centers_with_bass_validation
+    cross_validate = analyzer._perform_cross_validation
+    
+    def spy_modal(global_harmony, bass_analysis):
+        seen['modal'] = bass_analysis
+        return detect_modal(global_harmony, bass_analysis)
+    
+    def spy_cross(individual_analyses, part_groups, bass_analysis, *args):
+        seen['cross'] = bass_analysis
+        return cross_validate(individual_analyses, part_groups, bass_analysis, *args)
+    
+    monkeypatch.setattr(analyzer, '_detect_modal_centers_with_bass_validation', spy_modal)
+    monkeypatch.setattr(analyzer, '_perform_cross_validation', spy_cross)
+    analyzer.analyze_xml_precision('renamed.xml')
+    
+    assert seen['modal'] is not None
+    assert seen['modal'].instrument == 'bass_1'
+    assert seen['cross'] is seen['modal']
+
+def test_chord_description(analyzer):
+    """Chord symbols, roots and qualities come from music21's chord-symbol analysis."""
+    d_major = analyzer._generic_chord_detector(chord.Chord(['D4', 'F#4', 'A4']))
+    assert (d_major['symbol'], d_major['root'], d_major['quality']) == ('D', 'D', 'major')
+    
+    a_minor = analyzer._guitar_chord_detector(chord.Chord(['A3', 'C4', 'E4']))
+    assert (a_minor['symbol'], a_minor['root'], a_minor['quality']) == ('Am', 'A', 'minor')
+    
+    first_inversion = analyzer._generic_chord_detector(chord.Chord(['F#3', 'A3', 'D4']))
+    assert (first_inversion['symbol'], first_inversion['inversion']) == ('D/F#', 1)
+
+def test_chord_description_is_memoized(analyzer):
+    """Repeated chord shapes are described once and served from the cache."""
+    from harmonic_precision_analyzer import _describe_chord
+    
+    first = analyzer._generic_chord_detector(chord.Chord(['G3', 'B3', 'D4', 'F4']))
+    hits = _describe_chord.cache_info().hits
+    second = analyzer._generic_chord_detector(chord.Chord(['G3', 'B3', 'D4', 'F4']))
+    
+    assert first == second
+    assert (first['symbol'], first['quality']) == ('G7', 'major')
+    assert _describe_chord.cache_info().hits == hits + 1
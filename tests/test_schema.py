@@ -4,29 +4,63 @@ Unit tests for M1 JSON schema endpoints
 Tests /m1/schema and /m1/validate endpoints using Flask test_client
 """
 import pytest
-import json
-import sys
-import os
 
-# Add parent directory to path to import app module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# orjson encodes faster; json.dumps output is accepted as a request body too
+try:
+    import orjson
+except ImportError:
+    import json as orjson
 
-from app import app
+# Payloads that must fail validation
+_INVALID_PAYLOADS = {
+    "unknown_fields": {"invalid_field": "should not be here", "missing_required": "fields"},
+    "empty_object": {},
+    "missing_version": {"data": {"id": "test-123", "name": "Test Item"}},
+    "missing_data": {"version": "1.0.0"},
+    "wrong_version": {"version": "2.0.0", "data": {"id": "test-123", "name": "Test Item"}},
+    "missing_id": {"version": "1.0.0", "data": {"name": "Test Item"}},
+    "empty_name": {"version": "1.0.0", "data": {"id": "test-123", "name": ""}},
+    "extra_field": {"version": "1.0.0",
+                    "data": {"id": "test-123", "name": "Test Item", "extra_field": "z"}},
+}
+# Serialized once rather than by the client on every post
+_INVALID_BODY = orjson.dumps(_INVALID_PAYLOADS["unknown_fields"])
 
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+# Shape /m1/schema must return
+_SCHEMA_SHAPE = {
+    "type": "object",
+    "required": ["$schema", "title", "type", "properties"],
+    "anyOf": [{"required": ["$id"]}, {"required": ["id"]}],  # Allow both formats
+    "properties": {
+        "type": {"const": "object"},
+        "properties": {"type": "object"}
+    }
+}
 
-def load_sample_json():
-    """Load sample JSON from tests/data/sample_output_ok.json"""
-    data_file = os.path.join(os.path.dirname(__file__), 'data', 'sample_output_ok.json')
-    with open(data_file, 'r') as f:
-        return json.load(f)
+@pytest.fixture(scope="module")
+def schema_shape_error():
+    """First error of a schema against _SCHEMA_SHAPE (None if it matches), built once for the module
+    
+    Compiled with fastjsonschema when installed, otherwise checked with the jsonschema fallback.
+    """
+    try:
+        import fastjsonschema
+    except ImportError:
+        jsonschema = pytest.importorskip("jsonschema")
+        validator = jsonschema.validators.validator_for(_SCHEMA_SHAPE)(_SCHEMA_SHAPE)
+        return lambda schema: next((e.message for e in validator.iter_errors(schema)), None)
+    
+    check = fastjsonschema.compile(_SCHEMA_SHAPE)
+    
+    def first_error(schema):
+        try:
+            check(schema)
+        except fastjsonschema.JsonSchemaException as e:
+            return e.message
+        return None
+    return first_error
 
-def test_schema_endpoint_success(client):
+def test_schema_endpoint_success(client, schema_shape_error):
     """Test that /m1/schema returns valid schema"""
     response = client.get('/m1/schema')
     assert response.status_code == 200
@@ -36,54 +70,68 @@ def test_schema_endpoint_success(client):
     
     # Schema should be directly under data['schema'], not data['data']['schema']
     assert 'schema' in data
-    assert isinstance(data['schema'], dict)
     
-    schema = data['schema']
+    # Check basic schema structure and metadata in one pass
+    error = schema_shape_error(data['schema'])
+    assert error is None, f"Unexpected /m1/schema shape: {error}"
+
+def test_generated_validator_is_current(validate):
+    """_m1_validator.py matches the schema; run scripts/gen_validator.py if this fails"""
+    pytest.importorskip("fastjsonschema")
+    import app
+    import _m1_validator
+    
+    assert _m1_validator.SCHEMA_SHA256 == app.schema_sha256(app.SCHEMA)
+    assert validate is _m1_validator.validate
+    # A schema the module was not generated from is compiled at startup instead
+    assert app.load_generated_validator(app.FALLBACK_SCHEMA) is None
+
+def test_jsonschema_fallback_reports_first_error(monkeypatch, sample_output):
+    """Without fastjsonschema the jsonschema validator stops at the first error"""
+    jsonschema = pytest.importorskip("jsonschema")
+    import app
     
-    # Check basic schema structure
-    assert '$schema' in schema
-    assert '$id' in schema or 'id' in schema  # Allow both formats
-    assert 'title' in schema
-    assert 'type' in schema
-    assert 'properties' in schema
+    monkeypatch.setattr(app, '_FAST_VALIDATE', None)
+    monkeypatch.setattr(app, '_VALIDATOR', jsonschema.validators.validator_for(app.SCHEMA)(app.SCHEMA))
     
-    # Check schema metadata
-    assert schema['type'] == 'object'
+    assert app.schema_errors(sample_output) == []
+    assert app.schema_errors(_INVALID_PAYLOADS["unknown_fields"]) == ["'version' is a required property"]
 
-def test_validate_endpoint_success(client):
+def test_validate_endpoint_success(client, sample_output_body):
     """Test /m1/validate with valid JSON data"""
-    # Success tests should use and check sample_output_ok.json for validation
-    sample_data = load_sample_json()
-    
+    # Success tests should use and check sample_output_ok.json for validation,
+    # posted as the file's bytes so the client does not re-encode it
     response = client.post('/m1/validate',
-                          json=sample_data,
+                          data=sample_output_body,
                           content_type='application/json')
     
     assert response.status_code == 200
-    data = response.get_json()
-    assert data['status'] == 'success'
-    assert data['valid'] == True
+    assert response.get_json().items() >= {"status": "success", "valid": True}.items()
 
-def test_validate_endpoint_invalid_json(client):
+def test_schema_accepts_sample_output(validate, sample_output):
+    """The sample output passes the compiled validator directly"""
+    validate(sample_output)
+
+@pytest.mark.parametrize("payload", list(_INVALID_PAYLOADS.values()), ids=list(_INVALID_PAYLOADS))
+def test_schema_rejects_invalid_payload(validate, payload):
+    """Payloads that break the schema fail the compiled validator, without a Flask round-trip"""
+    fastjsonschema = pytest.importorskip("fastjsonschema")
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate(payload)
+
+def test_validate_endpoint_invalid_data(client):
     """Test /m1/validate with JSON that doesn't match schema"""
-    # This should fail validation
-    invalid_data = {
-        "invalid_field": "should not be here",
-        "missing_required": "fields"
-    }
-    
     response = client.post('/m1/validate',
-                          json=invalid_data,
+                          data=_INVALID_BODY,
                           content_type='application/json')
     
     # Should be 422 for validation error
     assert response.status_code == 422
     data = response.get_json()
-    assert data['status'] == 'error'
-    assert data['valid'] == False
+    assert data.items() >= {"status": "error", "valid": False, "error_code": "SCHEMA_MISMATCH"}.items()
     # Error assertions should check 'status' == 'error' and 'error' in payload, never 'message'
-    assert 'error' in data
-    assert isinstance(data.get('errors', []), list)
+    assert data.keys() >= {"error", "validation_errors"}
+    assert isinstance(data['validation_errors'], list)
 
 def test_validate_endpoint_no_json(client):
     """Test /m1/validate with no JSON data"""
@@ -93,46 +141,31 @@ def test_validate_endpoint_no_json(client):
     
     assert response.status_code == 400
     data = response.get_json()
-    assert data['status'] == 'error'
     # Error assertions should check 'status' == 'error' and 'error' in payload, never 'message'
+    assert data.items() >= {"status": "error", "error_code": "INVALID_JSON"}.items()
     assert 'error' in data
-    # Check for correct error message about JSON
-    assert ('JSON' in data['error'] or 'json' in data['error'] or
-            'Empty' in data['error'] or 'invalid' in data['error'])
 
-def test_validate_endpoint_empty_json(client):
-    """Test /m1/validate with empty JSON"""
+def test_validate_endpoint_malformed_json(client):
+    """Test /m1/validate with a JSON content type but an unparseable body"""
     response = client.post('/m1/validate',
-                          json={},
+                          data=b'{"version": ',
                           content_type='application/json')
     
-    # Empty JSON should be invalid against schema (missing required fields)
-    assert response.status_code == 422
-    data = response.get_json()
-    assert data['status'] == 'error'
-    assert data['valid'] == False
-    # Error assertions should check 'status' == 'error' and 'error' in payload, never 'message'
-    assert 'error' in data
-    assert isinstance(data.get('errors', []), list)
-
-def test_validate_endpoint_wrong_method(client):
-    """Test that GET on /m1/validate returns 405"""
-    response = client.get('/m1/validate')
-    
-    assert response.status_code == 405
-    data = response.get_json()
-    assert data['status'] == 'error'
-    # Error assertions should check 'status' == 'error' and 'error' in payload, never 'message'
-    assert 'error' in data
+    assert response.status_code == 400
+    assert response.get_json().items() >= {"status": "error", "error_code": "INVALID_JSON"}.items()
 
-def test_schema_endpoint_wrong_method(client):
-    """Test that POST on /m1/schema returns 405"""
-    response = client.post('/m1/schema')
+@pytest.mark.parametrize("method,url", [
+    ("GET", "/m1/validate"),
+    ("POST", "/m1/schema"),
+], ids=["get_validate", "post_schema"])
+def test_endpoint_wrong_method(client, method, url):
+    """Test that unsupported methods on /m1/validate and /m1/schema return 405"""
+    response = client.open(url, method=method)
     
     assert response.status_code == 405
     data = response.get_json()
-    assert data['status'] == 'error'
     # Error assertions should check 'status' == 'error' and 'error' in payload, never 'message'
+    assert data.items() >= {"status": "error", "error_code": "METHOD_NOT_ALLOWED"}.items()
     assert 'error' in data
 
 if __name__ == '__main__':